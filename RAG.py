@@ -1,8 +1,8 @@
 import os
 from typing import List, Any, Dict
-import openai
 from dotenv import load_dotenv
 from repo_processor import repo_processor
+from llm_gateway import LLMGateway, OpenAIProvider
 
 load_dotenv()
 
@@ -10,7 +10,7 @@ class RAG():
     def __init__(self, repo_url:str):
         self.repo_url   = repo_url
         self.repo_processor = repo_processor(self.repo_url)
-        self.llm_client = openai.OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+        self.llm_gateway = LLMGateway(OpenAIProvider(api_key=os.getenv("OPENAI_API_KEY")))
     
     def setup_repo(self):
         self.repo_processor.clone_repo()
@@ -44,13 +44,7 @@ class RAG():
         Please provide a detailed answer based on the code provided. Include code examples where relevant and explain how the code works."""
 
         try:
-            response = self.llm_client.chat.completions.create(
-                model="gpt-4",
-                max_tokens=2000,
-                messages=[{"role": "user", "content": prompt}]
-            )
-            
-            return response.choices[0].message.content
+            return self.llm_gateway.complete(prompt, model="gpt-4", max_tokens=2000, timeout=300)
         except Exception as e:
             return f"Error generating response: {str(e)}"
 
@@ -0,0 +1,63 @@
+#Purpose: measures cold import and start-up time of the entry points, each in a fresh interpreter
+#so nothing is already cached in sys.modules. Run: python benchmark.py
+
+import os
+import subprocess
+import sys
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+
+REPO_URL = "https://github.com/octocat/Hello-World"
+
+# (label, code timed in a fresh interpreter[, untimed setup run before it])
+CASES = [
+    ("import llm_gateway", "import llm_gateway"),
+    ("import repo_processor", "import repo_processor"),
+    ("import RAG", "import RAG"),
+    ("import main", "import main"),
+    ("import streamlit_app", "import streamlit_app"),
+    ("start-up repo_processor(url)", f"from repo_processor import repo_processor; repo_processor({REPO_URL!r})"),
+    ("start-up RAG(url)", f"from RAG import RAG; RAG({REPO_URL!r})"),
+    ("start-up PineconeRAGSystem()", "from streamlit_app import PineconeRAGSystem; PineconeRAGSystem()"),
+    # Timed after the import, so this is the background model load on its own
+    ("embedder warmup", "embedder_warmup().result()", "from streamlit_app import embedder_warmup"),
+]
+
+TIMER = """
+import time
+{setup}
+start = time.perf_counter()
+{code}
+print(time.perf_counter() - start)
+"""
+
+
+def time_case(code: str, setup: str = "", repeats: int = 3):
+    """
+    Runs the setup and then the timed code in a fresh interpreter `repeats` times.
+    Returns:
+        The best wall time in seconds, or the error line if the code failed.
+    """
+    timings = []
+    for _ in range(repeats):
+        # Run from the repo so the modules import wherever the script is launched from
+        result = subprocess.run([sys.executable, "-c", TIMER.format(setup=setup, code=code)],
+                                capture_output=True, text=True, cwd=REPO_DIR)
+        if result.returncode != 0:
+            lines = result.stderr.strip().splitlines()
+            return lines[-1] if lines else f"exit code {result.returncode}"
+        timings.append(float(result.stdout.strip().splitlines()[-1]))
+    return min(timings)
+
+
+def main():
+    print(f"{'case':<32} {'best of 3 (ms)':>16}")
+    for label, code, *setup in CASES:
+        timing = time_case(code, *setup)
+        if isinstance(timing, float):
+            print(f"{label:<32} {timing * 1000:>16.1f}")
+        else:
+            print(f"{label:<32} {'unavailable':>16}  ({timing})")
+
+if __name__ == "__main__":
+    main()
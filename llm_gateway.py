@@ -0,0 +1,250 @@
+#Purpose: shared LLM client layer used by RAG.py and streamlit_app.py. Wraps any provider with
+#a concurrency cap, token-bucket rate limiting, jittered retries, per-request timeouts and
+#coalescing of identical in-flight prompts so they share one upstream call.
+
+import hashlib
+import random
+import threading
+import time
+from concurrent.futures import Future
+from typing import Dict, List, Optional
+
+
+class RetryableError(Exception):
+    """Raised by providers for transient failures (rate limits, timeouts, 5xx) that are safe to retry."""
+
+
+class RetryableTimeoutError(RetryableError):
+    """Raised by providers when a request hit its timeout; the gateway retries it with a longer one."""
+
+
+# Same statuses the OpenAI/Anthropic SDKs retry by default (timeout, conflict, rate limit), plus >= 500,
+# which covers Anthropic's 529 "overloaded"
+RETRYABLE_STATUS_CODES = {408, 409, 429}
+
+
+def is_retryable_status(status_code: int) -> bool:
+    return status_code in RETRYABLE_STATUS_CODES or status_code >= 500
+
+
+def default_timeout(max_tokens: int) -> float:
+    """Generous non-streaming timeout: a fixed allowance plus ~10 tokens per second of generation."""
+    return 60.0 + max_tokens / 10
+
+
+class OpenAIProvider():
+    def __init__(self, api_key: Optional[str] = None):
+        self.api_key = api_key
+        self.client = None
+        self.connect_lock = threading.Lock()
+
+    def _connect(self):
+        # The SDK is imported on first call to keep start-up fast
+        with self.connect_lock:
+            if self.client is not None:
+                return
+            import openai
+            # Error classes are set first: other threads only check `client`
+            self.timeout_error = openai.APITimeoutError
+            self.connection_error = openai.APIConnectionError
+            self.status_error = openai.APIStatusError
+            # Retries are handled by the gateway, so the SDK must not retry on its own
+            self.client = openai.OpenAI(api_key=self.api_key, max_retries=0)
+
+    def complete(self, prompt: str, model: str, max_tokens: int, timeout: float) -> str:
+        if self.client is None:
+            self._connect()
+        try:
+            response = self.client.chat.completions.create(
+                model=model,
+                max_tokens=max_tokens,
+                messages=[{"role": "user", "content": prompt}],
+                timeout=timeout
+            )
+        except self.timeout_error as e:
+            raise RetryableTimeoutError(str(e)) from e
+        except self.connection_error as e:
+            raise RetryableError(str(e)) from e
+        except self.status_error as e:
+            if is_retryable_status(e.status_code):
+                raise RetryableError(str(e)) from e
+            raise
+        return response.choices[0].message.content
+
+
+class AnthropicProvider():
+    def __init__(self, api_key: Optional[str] = None):
+        self.api_key = api_key
+        self.client = None
+        self.connect_lock = threading.Lock()
+
+    def _connect(self):
+        with self.connect_lock:
+            if self.client is not None:
+                return
+            import anthropic
+            # Status codes rather than error classes: older SDKs have no OverloadedError for 529
+            self.timeout_error = anthropic.APITimeoutError
+            self.connection_error = anthropic.APIConnectionError
+            self.status_error = anthropic.APIStatusError
+            self.client = anthropic.Anthropic(api_key=self.api_key, max_retries=0)
+
+    def complete(self, prompt: str, model: str, max_tokens: int, timeout: float) -> str:
+        if self.client is None:
+            self._connect()
+        try:
+            response = self.client.messages.create(
+                model=model,
+                max_tokens=max_tokens,
+                messages=[{"role": "user", "content": prompt}],
+                timeout=timeout
+            )
+        except self.timeout_error as e:
+            raise RetryableTimeoutError(str(e)) from e
+        except self.connection_error as e:
+            raise RetryableError(str(e)) from e
+        except self.status_error as e:
+            if is_retryable_status(e.status_code):
+                raise RetryableError(str(e)) from e
+            raise
+        return response.content[0].text
+
+
+class StubProvider():
+    """
+    Local provider for testing the gateway without network access.
+    Args:
+        responses (List): Values returned (or exceptions raised) in order; the last one repeats.
+        delay (float): Seconds each call sleeps, to simulate upstream latency.
+    """
+    def __init__(self, responses: Optional[List] = None, delay: float = 0.0):
+        self.responses = list(responses) if responses else ["stub response"]
+        self.delay = delay
+        self.calls = 0
+        self.lock = threading.Lock()
+
+    def complete(self, prompt: str, model: str, max_tokens: int, timeout: float) -> str:
+        with self.lock:
+            response = self.responses[min(self.calls, len(self.responses) - 1)]
+            self.calls += 1
+        if self.delay:
+            time.sleep(self.delay)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+
+class TokenBucket():
+    """
+    Thread-safe token bucket: refills at `rate` tokens per second up to `capacity`.
+    """
+    def __init__(self, rate: float, capacity: float):
+        if rate <= 0:
+            raise ValueError(f"rate must be positive, got {rate}")
+        if capacity < 1:
+            raise ValueError(f"capacity must be at least 1, got {capacity}")
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.last_refill = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """Blocks until a token is available and consumes it."""
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.last_refill) * self.rate)
+                self.last_refill = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+class LLMGateway():
+    """
+    Provider-agnostic entry point for LLM completions.
+    Args:
+        provider: Object with a `complete(prompt, model, max_tokens, timeout) -> str` method.
+        max_concurrency (int): Maximum number of upstream calls running at once.
+        requests_per_second (float): Token-bucket refill rate for upstream calls.
+        burst (int): Token-bucket capacity.
+        max_retries (int): Retries after the first attempt for RetryableError failures.
+        timeout (float): Per-request timeout in seconds, passed to the provider. Defaults to
+            default_timeout(max_tokens); doubled for the retry after a timeout.
+        backoff_base (float): Initial backoff in seconds, doubled on each retry.
+        backoff_max (float): Upper bound for a single backoff.
+    """
+    def __init__(self, provider, max_concurrency: int = 4, requests_per_second: float = 2.0,
+                 burst: int = 4, max_retries: int = 3, timeout: Optional[float] = None,
+                 backoff_base: float = 1.0, backoff_max: float = 20.0):
+        if max_concurrency < 1:
+            raise ValueError(f"max_concurrency must be at least 1, got {max_concurrency}")
+        if max_retries < 0:
+            raise ValueError(f"max_retries must not be negative, got {max_retries}")
+        self.provider = provider
+        self.semaphore = threading.BoundedSemaphore(max_concurrency)
+        self.bucket = TokenBucket(requests_per_second, burst)
+        self.max_retries = max_retries
+        self.timeout = timeout
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+
+        # Identical prompts that are already being answered share the same Future
+        self.in_flight: Dict[str, Future] = {}
+        self.in_flight_lock = threading.Lock()
+
+    def complete(self, prompt: str, model: str, max_tokens: int = 2000,
+                 timeout: Optional[float] = None) -> str:
+        """
+        Returns the completion for a prompt, joining an identical in-flight call if there is one.
+        `timeout` overrides the gateway's timeout for this call.
+        Raises the provider's last error (the SDK error, not the RetryableError wrapper) once
+        retries are exhausted.
+        """
+        if timeout is None:
+            timeout = self.timeout if self.timeout is not None else default_timeout(max_tokens)
+        key = hashlib.sha256(f"{model}\x00{max_tokens}\x00{prompt}".encode()).hexdigest()
+
+        with self.in_flight_lock:
+            future = self.in_flight.get(key)
+            owner = future is None
+            if owner:
+                future = Future()
+                self.in_flight[key] = future
+
+        if not owner:
+            return future.result()
+
+        try:
+            future.set_result(self._call_with_retries(prompt, model, max_tokens, timeout))
+        except Exception as e:
+            future.set_exception(e)
+        except BaseException as e:
+            # KeyboardInterrupt/SystemExit still release the waiting callers before propagating
+            future.set_exception(e)
+            raise
+        finally:
+            with self.in_flight_lock:
+                del self.in_flight[key]
+        return future.result()
+
+    def _call_with_retries(self, prompt: str, model: str, max_tokens: int, timeout: float) -> str:
+        attempt = 0
+        while True:
+            self.bucket.acquire()
+            try:
+                with self.semaphore:
+                    return self.provider.complete(prompt, model, max_tokens, timeout)
+            except RetryableError as e:
+                if attempt >= self.max_retries:
+                    raise (e.__cause__ or e)
+                if isinstance(e, RetryableTimeoutError):
+                    # The same timeout would most likely cut off the same long answer again
+                    timeout *= 2
+                # Full jitter so retries from concurrent callers do not line up
+                backoff = min(self.backoff_max, self.backoff_base * 2 ** attempt)
+                time.sleep(random.uniform(0, backoff))
+                attempt += 1
@@ -1,9 +1,16 @@
-from repo_processor import repo_processor
+import sys
+
 
 def main():
+    if len(sys.argv) < 2:
+        print("Usage: python main.py <github_repo_url>")
+        sys.exit(1)
+
+    #Imported here so `python main.py` without arguments returns immediately
+    from repo_processor import repo_processor
+
     #Start repo processing
-    repo_processor()
+    repo_processor(sys.argv[1]).clone_repo()
 
 if __name__ == "__main__":
     main()
-    
\ No newline at end of file
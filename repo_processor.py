@@ -2,10 +2,8 @@
 #By: Bharath Nagam, Jul 18
 
 import os
-import git
 import shutil
 from pathlib import Path
-import chromadb
 import hashlib
 from typing import List, Dict, Any
 
@@ -15,23 +13,29 @@ class repo_processor():
         self.clone_path = f"./temp_repo_{hashlib.md5(repo_url.encode()).hexdigest()[:8]}"
         self.clone_location = self.clone_path
 
-        #chromadb client
-        self.client = chromadb.PersistentClient(path="./chroma_db")
-        self.collection = self.client.get_or_create_collection(name="github_repo")
+        #chromadb client, opened on first use
+        self._collection = None
 
-
-        # Download repo is it does not exist
-        print("!!!!!!! Step 1: Cloning Repo !!!!!!!!!!!!!")
-        self.clone_repo()
+    @property
+    def collection(self):
+        """ Opens the chromadb collection on first access, so construction stays cheap.
+        """
+        if self._collection is None:
+            import chromadb
+            client = chromadb.PersistentClient(path="./chroma_db")
+            self._collection = client.get_or_create_collection(name="github_repo")
+        return self._collection
     
     def clone_repo(self):
         """ Clones the target repository to the specified clone path if it does not already exist.
         """
+        print("!!!!!!! Step 1: Cloning Repo !!!!!!!!!!!!!")
         if os.path.exists(self.clone_location):
             print("Path already exists: {}".format(self.clone_location))
             print("!!!Cloning Done!!!!")
             return
         print("Processing cloning repo: {} to : {}".format(self.target_repo, self.clone_path))
+        import git
         git.Repo.clone_from(self.target_repo,self.clone_path)
         print("!!!Cloning Done!!!!")
     
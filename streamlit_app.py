@@ -1,10 +1,11 @@
 import streamlit as st
 import os
-from sentence_transformers import SentenceTransformer
-import anthropic
 from typing import List, Dict, Any
+import threading
 import time
+from concurrent.futures import Future
 from datetime import datetime
+from llm_gateway import LLMGateway, AnthropicProvider
 
 # Load environment variables for local development only
 try:
@@ -15,37 +16,46 @@ except ImportError:
     # Streamlit Cloud uses st.secrets instead
     pass
 
-# Handle Pinecone import with compatibility
-try:
-    from pinecone import Pinecone
-except ImportError:
-    st.error("❌ Please update your requirements.txt to use 'pinecone' instead of 'pinecone-client'")
-    st.stop()
+@st.cache_resource
+def start_embedder_warmup() -> Future:
+    """Loads the embedding model (same as used in migration) in a background thread while the UI renders"""
+    embedder = Future()
+
+    def load():
+        try:
+            from sentence_transformers import SentenceTransformer
+            embedder.set_result(SentenceTransformer('all-MiniLM-L6-v2'))
+        except Exception as e:
+            embedder.set_exception(e)
+
+    threading.Thread(target=load, name="embedder-warmup", daemon=True).start()
+    return embedder
+
+def embedder_warmup() -> Future:
+    """Returns the warmup Future, starting a new load if the cached one failed"""
+    embedder = start_embedder_warmup()
+    if embedder.done() and embedder.exception() is not None:
+        # Don't keep a failed download/load cached until the process restarts
+        start_embedder_warmup.clear()
+        embedder = start_embedder_warmup()
+    return embedder
 
 class PineconeRAGSystem:
     def __init__(self, pinecone_index_name: str = "turbo-rag-index"):
         self.pinecone_index_name = pinecone_index_name
         
-        # Initialize Pinecone
-        try:
-            # Try to get API key from Streamlit secrets first, then environment variables
-            pinecone_api_key = st.secrets.get("PINECONE_API_KEY") or os.getenv('PINECONE_API_KEY')
-            if not pinecone_api_key:
-                st.error("❌ PINECONE_API_KEY not found in secrets or environment variables")
-                st.stop()
-                
-            self.pinecone_client = Pinecone(api_key=pinecone_api_key)
-            self.pinecone_index = self.pinecone_client.Index(pinecone_index_name)
-        except Exception as e:
-            st.error(f"Failed to connect to Pinecone: {e}")
+        # Pinecone is connected on first use
+        # Try to get API key from Streamlit secrets first, then environment variables
+        self.pinecone_api_key = st.secrets.get("PINECONE_API_KEY") or os.getenv('PINECONE_API_KEY')
+        if not self.pinecone_api_key:
+            st.error("❌ PINECONE_API_KEY not found in secrets or environment variables")
             st.stop()
+        self._pinecone_index = None
+        # Shared across sessions through st.cache_resource, so first searches can race
+        self._pinecone_lock = threading.Lock()
         
-        # Initialize embedding model (same as used in migration)
-        @st.cache_resource
-        def load_embedder():
-            return SentenceTransformer('all-MiniLM-L6-v2')
-        
-        self.embedder = load_embedder()
+        # Embedding model keeps loading in the background until the first search needs it
+        embedder_warmup()
         
         # Initialize Anthropic Claude
         try:
@@ -55,11 +65,37 @@ class PineconeRAGSystem:
                 st.error("❌ ANTHROPIC_API_KEY not found in secrets or environment variables")
                 st.stop()
                 
-            self.anthropic_client = anthropic.Anthropic(api_key=anthropic_api_key)
+            self.llm_gateway = LLMGateway(AnthropicProvider(api_key=anthropic_api_key))
         except Exception as e:
             st.error(f"Failed to initialize Claude: {e}")
             st.stop()
     
+    @property
+    def pinecone_index(self):
+        """Pinecone index, imported and connected on first access"""
+        if self._pinecone_index is None:
+            with self._pinecone_lock:
+                if self._pinecone_index is None:
+                    # Handle Pinecone import with compatibility
+                    try:
+                        from pinecone import Pinecone
+                    except ImportError:
+                        st.error("❌ Please update your requirements.txt to use 'pinecone' instead of 'pinecone-client'")
+                        st.stop()
+                    
+                    try:
+                        pinecone_client = Pinecone(api_key=self.pinecone_api_key)
+                        self._pinecone_index = pinecone_client.Index(self.pinecone_index_name)
+                    except Exception as e:
+                        st.error(f"Failed to connect to Pinecone: {e}")
+                        st.stop()
+        return self._pinecone_index
+    
+    @property
+    def embedder(self):
+        """Embedding model, waiting for the background warmup if it has not finished yet"""
+        return embedder_warmup().result()
+    
     def search_relevant_content(self, query: str, top_k: int = 5, source_filter: str = None) -> List[Dict[str, Any]]:
         """Search for relevant content in Pinecone"""
         try:
@@ -151,13 +187,7 @@ class PineconeRAGSystem:
         # Get response from Claude
         response_start = time.time()
         try:
-            response = self.anthropic_client.messages.create(
-                model="claude-sonnet-4-20250514",
-                max_tokens=2000,
-                messages=[{"role": "user", "content": prompt}]
-            )
-            
-            answer = response.content[0].text
+            answer = self.llm_gateway.complete(prompt, model="claude-sonnet-4-20250514", max_tokens=2000, timeout=300)
             response_time = time.time() - response_start
             
             return {
@@ -229,6 +259,9 @@ def main():
         initial_sidebar_state="expanded"
     )
     
+    # Start loading the embedding model before anything else is rendered
+    embedder_warmup()
+    
     # Custom CSS
     st.markdown("""
     <style>
@@ -300,7 +333,7 @@ def main():
     
     try:
         rag_system = init_rag_system()
-        st.success("✅ Connected to Pinecone and Claude successfully!")
+        st.success("✅ RAG system ready. Pinecone connects once the page has rendered, Claude on the first answer")
     except Exception as e:
         st.error(f"❌ Failed to initialize RAG system: {e}")
         st.stop()
@@ -332,16 +365,9 @@ def main():
         
         # Index statistics
         st.subheader("📊 Database Stats")
-        with st.spinner("Loading stats..."):
-            stats = rag_system.get_index_stats()
-            
-        if stats:
-            st.markdown(f"""
-            <div class="stats-container">
-                <strong>Total Documents:</strong> {stats.get('total_vectors', 0):,}<br>
-                <strong>Index Fullness:</strong> {stats.get('index_fullness', 0):.1%}
-            </div>
-            """, unsafe_allow_html=True)
+        # Filled at the end of main() so the page renders before Pinecone is contacted
+        stats_placeholder = st.empty()
+        stats_placeholder.caption("Loading stats...")
         
         # Example questions
         st.subheader("💡 Example Questions")
@@ -457,6 +483,18 @@ def main():
         "💡 **Tip:** Try asking specific questions about your code, team discussions, or system architecture. "
         "The more specific your question, the better the answer!"
     )
+    
+    # Index statistics, fetched after the main content has rendered
+    stats = rag_system.get_index_stats()
+    if stats:
+        stats_placeholder.markdown(f"""
+        <div class="stats-container">
+            <strong>Total Documents:</strong> {stats.get('total_vectors', 0):,}<br>
+            <strong>Index Fullness:</strong> {stats.get('index_fullness', 0):.1%}
+        </div>
+        """, unsafe_allow_html=True)
+    else:
+        stats_placeholder.empty()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
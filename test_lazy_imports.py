@@ -0,0 +1,39 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+HEAVY_MODULES = ["chromadb", "git", "openai", "anthropic"]
+
+
+def modules_loaded_after(code: str):
+    """Runs the code in a fresh interpreter and returns which heavy modules ended up in sys.modules."""
+    check = f"""
+import sys
+{code}
+print(",".join(name for name in {HEAVY_MODULES!r} if name in sys.modules))
+"""
+    result = subprocess.run([sys.executable, "-c", check], capture_output=True, text=True, cwd=REPO_DIR)
+    assert result.returncode == 0, result.stderr
+    return [name for name in result.stdout.strip().split(",") if name]
+
+
+@pytest.mark.parametrize("code", [
+    "import llm_gateway",
+    "import repo_processor",
+    "import main",
+    "from repo_processor import repo_processor; repo_processor('https://github.com/octocat/Hello-World')",
+])
+def test_heavy_modules_are_not_imported_at_start_up(code):
+    assert modules_loaded_after(code) == []
+
+
+@pytest.mark.parametrize("code", [
+    "import RAG",
+    "from RAG import RAG; RAG('https://github.com/octocat/Hello-World')",
+])
+def test_rag_start_up_does_not_import_heavy_modules(code):
+    pytest.importorskip("dotenv")
+    assert modules_loaded_after(code) == []
@@ -0,0 +1,258 @@
+import sys
+import threading
+import time
+import types
+
+import pytest
+
+from llm_gateway import (AnthropicProvider, LLMGateway, OpenAIProvider, RetryableError,
+                         RetryableTimeoutError, StubProvider, TokenBucket)
+
+
+def run_concurrently(gateway, prompts):
+    results = [None] * len(prompts)
+
+    def call(i):
+        results[i] = gateway.complete(prompts[i], model="stub")
+
+    threads = [threading.Thread(target=call, args=(i,)) for i in range(len(prompts))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def fake_sdk(outcomes):
+    """
+    Minimal stand-in for the openai/anthropic modules: both expose the same error classes, and the
+    client's create() returns the queued outcomes in order; an int outcome raises APIStatusError.
+    """
+    class APIConnectionError(Exception):
+        pass
+
+    class APITimeoutError(APIConnectionError):
+        pass
+
+    class APIStatusError(Exception):
+        def __init__(self, status_code):
+            super().__init__(f"status {status_code}")
+            self.status_code = status_code
+
+    calls = []
+
+    def create(**kwargs):
+        calls.append(kwargs)
+        outcome = outcomes[min(len(calls), len(outcomes)) - 1]
+        if isinstance(outcome, int):
+            raise APIStatusError(outcome)
+        return types.SimpleNamespace(
+            content=[types.SimpleNamespace(text=outcome)],
+            choices=[types.SimpleNamespace(message=types.SimpleNamespace(content=outcome))])
+
+    def client(api_key, max_retries):
+        endpoint = types.SimpleNamespace(create=create)
+        return types.SimpleNamespace(messages=endpoint, chat=types.SimpleNamespace(completions=endpoint))
+
+    module = types.SimpleNamespace(APIConnectionError=APIConnectionError, APITimeoutError=APITimeoutError,
+                                   APIStatusError=APIStatusError, Anthropic=client, OpenAI=client)
+    return module, calls
+
+
+class ConcurrencyTrackingProvider(StubProvider):
+    def __init__(self, delay: float):
+        super().__init__(delay=delay)
+        self.running = 0
+        self.max_running = 0
+
+    def complete(self, prompt, model, max_tokens, timeout):
+        with self.lock:
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+        try:
+            return super().complete(prompt, model, max_tokens, timeout)
+        finally:
+            with self.lock:
+                self.running -= 1
+
+
+def test_identical_concurrent_prompts_share_one_call():
+    provider = StubProvider(["answer"], delay=0.2)
+    gateway = LLMGateway(provider)
+
+    results = run_concurrently(gateway, ["same question"] * 5)
+
+    assert results == ["answer"] * 5
+    assert provider.calls == 1
+    assert gateway.in_flight == {}
+
+
+def test_retryable_errors_are_retried_until_success():
+    provider = StubProvider([RetryableError("429"), RetryableError("429"), "ok"])
+    gateway = LLMGateway(provider, backoff_base=0.01)
+
+    assert gateway.complete("question", model="stub") == "ok"
+    assert provider.calls == 3
+
+
+def test_retries_exhausted_raises_last_error():
+    provider = StubProvider([RetryableError("429")])
+    gateway = LLMGateway(provider, max_retries=2, backoff_base=0.01)
+
+    with pytest.raises(RetryableError):
+        gateway.complete("question", model="stub")
+    assert provider.calls == 3
+    assert gateway.in_flight == {}
+
+
+def test_retries_exhausted_raises_sdk_error():
+    sdk_error = ConnectionError("upstream")
+    wrapped = RetryableError("upstream")
+    wrapped.__cause__ = sdk_error
+    gateway = LLMGateway(StubProvider([wrapped]), max_retries=1, backoff_base=0.01)
+
+    with pytest.raises(ConnectionError) as excinfo:
+        gateway.complete("question", model="stub")
+    assert excinfo.value is sdk_error
+
+
+def test_timeout_is_doubled_on_retry():
+    class TimeoutRecordingProvider(StubProvider):
+        def __init__(self):
+            super().__init__([RetryableTimeoutError("timed out"), RetryableError("429"), "ok"])
+            self.timeouts = []
+
+        def complete(self, prompt, model, max_tokens, timeout):
+            self.timeouts.append(timeout)
+            return super().complete(prompt, model, max_tokens, timeout)
+
+    provider = TimeoutRecordingProvider()
+    gateway = LLMGateway(provider, backoff_base=0.01)
+
+    assert gateway.complete("question", model="stub", timeout=100) == "ok"
+    assert provider.timeouts == [100, 200, 200]
+
+
+def test_default_timeout_scales_with_max_tokens():
+    provider = StubProvider()
+    timeouts = []
+    provider.complete = lambda prompt, model, max_tokens, timeout: timeouts.append(timeout) or "ok"
+    gateway = LLMGateway(provider)
+
+    gateway.complete("short", model="stub", max_tokens=100)
+    gateway.complete("long", model="stub", max_tokens=2000)
+
+    assert timeouts[1] > timeouts[0] >= 60
+
+
+@pytest.mark.parametrize("module_name, provider_class, status_code", [
+    ("anthropic", AnthropicProvider, 529),
+    ("anthropic", AnthropicProvider, 500),
+    ("openai", OpenAIProvider, 408),
+    ("openai", OpenAIProvider, 409),
+    ("openai", OpenAIProvider, 429),
+])
+def test_retryable_status_codes_are_retried(monkeypatch, module_name, provider_class, status_code):
+    sdk, calls = fake_sdk([status_code, "ok"])
+    monkeypatch.setitem(sys.modules, module_name, sdk)
+    gateway = LLMGateway(provider_class(api_key="key"), backoff_base=0.01)
+
+    assert gateway.complete("question", model="model") == "ok"
+    assert len(calls) == 2
+
+
+def test_client_errors_are_not_retried(monkeypatch):
+    sdk, calls = fake_sdk([400, "ok"])
+    monkeypatch.setitem(sys.modules, "anthropic", sdk)
+    gateway = LLMGateway(AnthropicProvider(api_key="key"), backoff_base=0.01)
+
+    with pytest.raises(sdk.APIStatusError) as excinfo:
+        gateway.complete("question", model="model")
+    assert excinfo.value.status_code == 400
+    assert len(calls) == 1
+
+
+def test_non_retryable_errors_are_not_retried():
+    provider = StubProvider([ValueError("bad request"), "ok"])
+    gateway = LLMGateway(provider, backoff_base=0.01)
+
+    with pytest.raises(ValueError):
+        gateway.complete("question", model="stub")
+    assert provider.calls == 1
+
+
+def test_concurrency_cap_holds():
+    provider = ConcurrencyTrackingProvider(delay=0.1)
+    gateway = LLMGateway(provider, max_concurrency=2, requests_per_second=100, burst=10)
+
+    run_concurrently(gateway, [f"question {i}" for i in range(6)])
+
+    assert provider.calls == 6
+    assert provider.max_running == 2
+
+
+def test_token_bucket_limits_rate():
+    provider = StubProvider()
+    gateway = LLMGateway(provider, requests_per_second=5, burst=1)
+
+    start = time.monotonic()
+    for i in range(6):
+        gateway.complete(f"question {i}", model="stub")
+
+    # The first call uses the burst token, the other five wait 0.2s each
+    assert time.monotonic() - start >= 0.95
+
+
+def test_base_exception_releases_waiting_callers():
+    release = threading.Event()
+
+    class InterruptingProvider(StubProvider):
+        def complete(self, prompt, model, max_tokens, timeout):
+            release.wait()
+            raise KeyboardInterrupt
+
+    gateway = LLMGateway(InterruptingProvider())
+    errors = []
+
+    def owner():
+        try:
+            gateway.complete("question", model="stub")
+        except KeyboardInterrupt as e:
+            errors.append(e)
+
+    def waiter():
+        try:
+            gateway.complete("question", model="stub")
+        except KeyboardInterrupt as e:
+            errors.append(e)
+
+    owner_thread = threading.Thread(target=owner, daemon=True)
+    owner_thread.start()
+    while not gateway.in_flight:
+        time.sleep(0.01)
+    waiter_thread = threading.Thread(target=waiter, daemon=True)
+    waiter_thread.start()
+    time.sleep(0.05)
+    release.set()
+    owner_thread.join(timeout=2)
+    waiter_thread.join(timeout=2)
+
+    assert not waiter_thread.is_alive()
+    assert len(errors) == 2
+
+
+@pytest.mark.parametrize("kwargs", [
+    {"requests_per_second": 0},
+    {"requests_per_second": -1},
+    {"burst": 0},
+    {"max_concurrency": 0},
+    {"max_retries": -1},
+])
+def test_invalid_config_is_rejected(kwargs):
+    with pytest.raises(ValueError):
+        LLMGateway(StubProvider(), **kwargs)
+
+
+def test_token_bucket_rejects_invalid_rate():
+    with pytest.raises(ValueError):
+        TokenBucket(rate=0, capacity=1)